@@ -0,0 +1 @@
+"""Benchmarks da API de tarefas. Cada módulo roda com ``python -m benchmarks.<nome>``."""
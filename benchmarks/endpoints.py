@@ -0,0 +1,179 @@
+"""Benchmark HTTP em processo de todos os endpoints de /tarefas.
+
+Dirige o ``app`` por um ``httpx.ASGITransport`` (sem rede) contra um banco
+temporário semeado com 1k / 100k / 1M tarefas, e mede vazão e latência
+p50/p95/p99 de criar, listar (página rasa e profunda, por offset e por cursor,
+para cada ``sort_by``), concluir e remover, em vários níveis de concorrência.
+O resultado sai em JSON, para comparar execuções ao longo do tempo.
+
+Uso: python -m benchmarks.endpoints [--tamanhos 1000,100000,1000000] [--concorrencia 1,8,32]
+                                    [--requisicoes 200] [--auth token|basic] [--com-cache] [--saida arquivo.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="bench-endpoints-")
+os.environ.setdefault("TAREFAS_DB_PATH", os.path.join(_tmpdir.name, "app.db"))
+if "--com-cache" not in sys.argv:
+    # Sem o cache de listagem, cada GET mede o caminho real até o banco
+    os.environ.setdefault("TAREFAS_LIST_CACHE_SIZE", "0")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+
+USUARIO = ("admin", "admin123")
+PALAVRAS = ["comprar", "lavar", "pagar", "revisar", "enviar", "ligar", "relatório", "carro", "conta", "email"]
+SORTS = ("nome", "descricao", "concluida")
+
+
+def semear(ate: int) -> None:
+    # Insere direto no SQLite (os triggers de busca, contadores e versão continuam valendo)
+    conn = sqlite3.connect(main.DATABASE_PATH)
+    conn.execute("PRAGMA synchronous = OFF")
+    atual = conn.execute("SELECT total FROM tarefas_contadores").fetchone()[0]
+    lote = 50_000
+    for inicio in range(atual, ate, lote):
+        conn.executemany(
+            "INSERT OR IGNORE INTO tarefas (nome, descricao, concluida) VALUES (?, ?, ?)",
+            (
+                (f"seed-{i:07d}", f"{PALAVRAS[i % 10]} {PALAVRAS[(i // 10) % 10]} {i}", i % 3 == 0)
+                for i in range(inicio, min(inicio + lote, ate))
+            ),
+        )
+        conn.commit()
+    conn.close()
+
+
+def percentis(latencias: list) -> dict:
+    if len(latencias) < 2:
+        valor = round(latencias[0] * 1000, 3) if latencias else None
+        return {"p50_ms": valor, "p95_ms": valor, "p99_ms": valor}
+    cortes = statistics.quantiles(latencias, n=100, method="inclusive")
+    return {"p50_ms": round(cortes[49] * 1000, 3), "p95_ms": round(cortes[94] * 1000, 3), "p99_ms": round(cortes[98] * 1000, 3)}
+
+
+async def medir(client: httpx.AsyncClient, requisicoes, total: int, concorrencia: int) -> dict:
+    # "requisicoes" é um iterador de (método, url, kwargs), consumido pelos workers
+    latencias, erros = [], 0
+    fonte = itertools.islice(requisicoes, total)
+
+    async def worker():
+        nonlocal erros
+        for metodo, url, kwargs in fonte:
+            inicio = time.perf_counter()
+            resposta = await client.request(metodo, url, **kwargs)
+            latencias.append(time.perf_counter() - inicio)
+            if resposta.status_code >= 400:
+                erros += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+    return {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "vazao_req_s": round(len(latencias) / duracao, 1) if duracao else None,
+        **percentis(latencias),
+    }
+
+
+def cursor_profundo(sort_by: str, posicao: int) -> str:
+    # Cursor equivalente a ter paginado até "posicao", sem percorrer as páginas
+    coluna = "concluida" if sort_by == "concluida" else sort_by
+    conn = sqlite3.connect(main.DATABASE_PATH)
+    valor, tarefa_id = conn.execute(
+        f"SELECT {coluna}, id FROM tarefas ORDER BY {coluna}, id LIMIT 1 OFFSET ?", (posicao,)
+    ).fetchone()
+    conn.close()
+    return main.encode_cursor(sort_by, bool(valor) if sort_by == "concluida" else valor, tarefa_id)
+
+
+def cenarios(tamanho: int, rodada: str):
+    # Cada cenário gera requisições sem fim; medir() corta na quantidade pedida
+    contador = itertools.count()
+    tamanho_pagina = 100
+    pagina_profunda = max(1, tamanho // tamanho_pagina - 1)
+    yield "criar", (
+        ("POST", "/tarefas/", {"json": {"nome": f"bench-{rodada}-{i}", "descricao": "criada pelo benchmark"}})
+        for i in contador
+    )
+    for sort_by in SORTS:
+        yield f"listar_raso_{sort_by}", itertools.repeat(
+            ("GET", "/tarefas/", {"params": {"page": 1, "size": tamanho_pagina, "sort_by": sort_by}})
+        )
+        yield f"listar_profundo_offset_{sort_by}", itertools.repeat(
+            ("GET", "/tarefas/", {"params": {"page": pagina_profunda, "size": tamanho_pagina, "sort_by": sort_by}})
+        )
+        cursor = cursor_profundo(sort_by, (pagina_profunda - 1) * tamanho_pagina)
+        yield f"listar_profundo_cursor_{sort_by}", itertools.repeat(
+            ("GET", "/tarefas/", {"params": {"cursor": cursor, "size": tamanho_pagina, "sort_by": sort_by}})
+        )
+    yield "concluir", (("PUT", f"/tarefas/seed-{(i * 7919) % tamanho:07d}", {}) for i in itertools.count())
+    yield "remover", (("DELETE", f"/tarefas/bench-{rodada}-{i}", {}) for i in itertools.count())
+
+
+async def executar(tamanhos: list, concorrencias: list, total: int, auth: str) -> dict:
+    resultados = {
+        "inicio": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "perfil_sqlite": main.SQLITE_PROFILE,
+        "cache_listagem": main.list_cache.max_size > 0,
+        "auth": auth,
+        "requisicoes_por_cenario": total,
+        "execucoes": [],
+    }
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            if auth == "token":
+                token = (await client.post("/token", auth=USUARIO)).json()["access_token"]
+                client.headers["Authorization"] = f"Bearer {token}"
+            else:
+                client.auth = USUARIO
+            for tamanho in tamanhos:
+                inicio = time.perf_counter()
+                semear(tamanho)
+                print(f"semeado: {tamanho} tarefas em {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+                for concorrencia in concorrencias:
+                    rodada = f"{tamanho}-{concorrencia}"
+                    for nome, requisicoes in cenarios(tamanho, rodada):
+                        medida = await medir(client, requisicoes, total, concorrencia)
+                        resultados["execucoes"].append(
+                            {"tamanho": tamanho, "concorrencia": concorrencia, "cenario": nome, **medida}
+                        )
+                        print(f"{tamanho:>8} c={concorrencia:<3} {nome:<34} {medida}", file=sys.stderr)
+    return resultados
+
+
+def lista_inteiros(valor: str) -> list:
+    return [int(item) for item in valor.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=lista_inteiros, default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--concorrencia", type=lista_inteiros, default=[1, 8, 32])
+    parser.add_argument("--requisicoes", type=int, default=200, help="Requisições por cenário")
+    parser.add_argument("--auth", choices=("token", "basic"), default="token")
+    parser.add_argument("--com-cache", action="store_true", help="Mantém o cache de respostas da listagem")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    resultados = asyncio.run(executar(sorted(args.tamanhos), args.concorrencia, args.requisicoes, args.auth))
+    saida = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(saida + "\n")
+    else:
+        print(saida)
@@ -0,0 +1,102 @@
+"""Vazão de escrita antes e depois das migrações de índices.
+
+Monta dois bancos temporários: um no esquema anterior às migrações (com o
+índice redundante em ``tarefas.id``) e outro com as migrações aplicadas, e
+mede nos dois a inserção linha a linha com commit (como ``adicionar_tarefa``)
+e a inserção em lote em uma única transação (como ``/tarefas/batch``).
+
+Uso: python -m benchmarks.escrita_indices [--linhas-commit N] [--linhas-lote N] [--repeticoes N] [--saida arquivo.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="bench-indices-")
+os.environ.setdefault("TAREFAS_DB_PATH", os.path.join(_tmpdir.name, "app.db"))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+
+import main  # noqa: E402
+
+
+def criar_banco(nome: str, migrado: bool):
+    engine = create_engine(f"sqlite:///{os.path.join(_tmpdir.name, nome)}")
+    event.listen(engine, "connect", main.apply_sqlite_pragmas)
+    main.criar_esquema(engine)
+    if not migrado:
+        # Volta ao esquema da versão 0: recria o que as migrações removeram
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_tarefas_id ON tarefas (id)")
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+    return engine
+
+
+def indices(engine) -> list:
+    with engine.connect() as conn:
+        result = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tarefas' ORDER BY name"
+        )
+        return [nome for (nome,) in result]
+
+
+def medir_insercao_com_commit(engine, linhas: int) -> float:
+    inicio = time.perf_counter()
+    with engine.connect() as conn:
+        for i in range(linhas):
+            conn.execute(insert(main.TarefaDB).values(nome=f"commit-{i}", descricao=f"descrição {i}", concluida=False))
+            conn.commit()
+    return linhas / (time.perf_counter() - inicio)
+
+
+def medir_insercao_em_lote(engine, linhas: int) -> float:
+    dados = [{"nome": f"lote-{i}", "descricao": f"descrição {i}", "concluida": i % 2 == 0} for i in range(linhas)]
+    inicio = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(insert(main.TarefaDB), dados)
+    return linhas / (time.perf_counter() - inicio)
+
+
+def executar(linhas_commit: int, linhas_lote: int, repeticoes: int) -> dict:
+    resultados = {
+        "perfil_sqlite": main.SQLITE_PROFILE,
+        "linhas_commit": linhas_commit,
+        "linhas_lote": linhas_lote,
+        "repeticoes": repeticoes,
+    }
+    medidas = {"antes": [], "depois": []}
+    # Alterna a ordem a cada repetição para não favorecer um dos lados (cache do SO, aquecimento)
+    for repeticao in range(repeticoes):
+        ordem = (("antes", False), ("depois", True))
+        for rotulo, migrado in ordem if repeticao % 2 == 0 else reversed(ordem):
+            engine = criar_banco(f"{rotulo}-{repeticao}.db", migrado)
+            medidas[rotulo].append((
+                medir_insercao_com_commit(engine, linhas_commit),
+                medir_insercao_em_lote(engine, linhas_lote),
+            ))
+            resultados.setdefault(rotulo, {"indices": indices(engine)})
+            engine.dispose()
+    for rotulo, valores in medidas.items():
+        resultados[rotulo]["insercao_com_commit_linhas_s"] = round(statistics.median(v[0] for v in valores), 1)
+        resultados[rotulo]["insercao_em_lote_linhas_s"] = round(statistics.median(v[1] for v in valores), 1)
+    for metrica in ("insercao_com_commit_linhas_s", "insercao_em_lote_linhas_s"):
+        resultados[f"ganho_{metrica}"] = round(resultados["depois"][metrica] / resultados["antes"][metrica], 3)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas-commit", type=int, default=2000)
+    parser.add_argument("--linhas-lote", type=int, default=50000)
+    parser.add_argument("--repeticoes", type=int, default=3, help="Mediana de N execuções alternadas")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    resultados = json.dumps(executar(args.linhas_commit, args.linhas_lote, args.repeticoes), indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(resultados + "\n")
+    else:
+        print(resultados)
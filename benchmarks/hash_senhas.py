@@ -0,0 +1,88 @@
+"""Latência de verificação de senha para cada configuração de hash.
+
+Para cada configuração (bcrypt com N rounds, argon2 com time_cost:memory_cost
+quando o argon2-cffi estiver instalado) monta o contexto com
+``main.criar_contexto_senhas``, gera o hash de uma senha e mede
+``verify_and_update`` repetidas vezes, como no login. Também informa se o hash
+padrão do admin seria refeito sob aquela configuração.
+
+Uso: python -m benchmarks.hash_senhas [--bcrypt-rounds 10,11,12,13] [--argon2 2:19456,3:65536]
+                                      [--verificacoes N] [--saida arquivo.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="bench-hash-senhas-")
+os.environ.setdefault("TAREFAS_DB_PATH", os.path.join(_tmpdir.name, "app.db"))
+
+from passlib import hash as passlib_hash  # noqa: E402
+
+import main  # noqa: E402
+
+SENHA = "admin123"
+
+
+def medir(contexto, verificacoes: int) -> dict:
+    hashed = contexto.hash(SENHA)
+    valida, novo_hash = contexto.verify_and_update(SENHA, hashed)
+    assert valida and novo_hash is None
+    latencias = []
+    for _ in range(verificacoes):
+        inicio = time.perf_counter()
+        contexto.verify_and_update(SENHA, hashed)
+        latencias.append(time.perf_counter() - inicio)
+    return {
+        "prefixo_hash": hashed[:hashed.rfind("$") + 1],
+        "verificacao_p50_ms": round(statistics.median(latencias) * 1000, 2),
+        "verificacao_max_ms": round(max(latencias) * 1000, 2),
+        "verificacoes_s_por_nucleo": round(1 / statistics.median(latencias), 1),
+        "refaz_hash_do_admin": contexto.needs_update(main.ADMIN_PASSWORD_HASH),
+    }
+
+
+def configuracoes(bcrypt_rounds: list, argon2: list):
+    for rounds in bcrypt_rounds:
+        yield {"scheme": "bcrypt", "rounds": rounds}, {"bcrypt_rounds": rounds}
+    for time_cost, memory_cost in argon2:
+        yield (
+            {"scheme": "argon2", "time_cost": time_cost, "memory_cost_kib": memory_cost},
+            {"argon2_time_cost": time_cost, "argon2_memory_cost": memory_cost},
+        )
+
+
+def executar(bcrypt_rounds: list, argon2: list, verificacoes: int) -> dict:
+    resultados = {"verificacoes": verificacoes, "argon2_disponivel": passlib_hash.argon2.has_backend(), "medidas": []}
+    if not resultados["argon2_disponivel"]:
+        argon2 = []  # sem argon2-cffi só o bcrypt é medido
+    for descricao, custos in configuracoes(bcrypt_rounds, argon2):
+        contexto = main.criar_contexto_senhas([descricao["scheme"]], **custos)
+        resultados["medidas"].append({**descricao, **medir(contexto, verificacoes)})
+    return resultados
+
+
+def lista_inteiros(valor: str) -> list:
+    return [int(item) for item in valor.split(",") if item]
+
+
+def lista_argon2(valor: str) -> list:
+    return [tuple(int(parte) for parte in item.split(":")) for item in valor.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bcrypt-rounds", type=lista_inteiros, default=[10, 11, 12, 13])
+    parser.add_argument("--argon2", type=lista_argon2, default=[(2, 19456), (3, 65536)], help="time_cost:memory_cost_kib")
+    parser.add_argument("--verificacoes", type=int, default=20, help="Verificações por configuração")
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    resultados = json.dumps(executar(args.bcrypt_rounds, args.argon2, args.verificacoes), indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(resultados + "\n")
+    else:
+        print(resultados)
@@ -0,0 +1,126 @@
+"""Custo por página de hidratar entidades do ORM versus ler colunas pelo Core.
+
+Semeia um banco temporário e lê a mesma página (keyset por nome) de duas formas:
+
+- ``orm``: ``select(TarefaDB)`` em uma AsyncSession, instâncias rastreadas no
+  identity map e serializadas pelo Pydantic com from_attributes;
+- ``core``: ``select(*COLUNAS_LEITURA)``, linhas leves serializadas por
+  ``main.serializar_linhas`` (o caminho atual dos endpoints de leitura).
+
+Mede o tempo de CPU por página e o pico de memória alocada (tracemalloc).
+
+Uso: python -m benchmarks.hidratacao [--linhas N] [--tamanho-pagina N] [--paginas N] [--saida arquivo.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="bench-hidratacao-")
+os.environ.setdefault("TAREFAS_DB_PATH", os.path.join(_tmpdir.name, "app.db"))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select, tuple_  # noqa: E402
+
+import main  # noqa: E402
+
+tarefas_adapter = TypeAdapter(List[main.Tarefa])
+
+
+def semear(linhas: int) -> None:
+    main.criar_esquema(main.engine)
+    conn = sqlite3.connect(main.DATABASE_PATH)
+    conn.executemany(
+        "INSERT INTO tarefas (nome, descricao, concluida) VALUES (?, ?, ?)",
+        ((f"tarefa-{i:07d}", f"descrição da tarefa número {i}", i % 3 == 0) for i in range(linhas)),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def pagina_orm(inicio: str, tamanho: int) -> bytes:
+    async with main.ReadSessionLocal() as db:
+        query = (
+            select(main.TarefaDB)
+            .where(tuple_(main.TarefaDB.nome, main.TarefaDB.id) > tuple_(inicio, 0))
+            .order_by(main.TarefaDB.nome, main.TarefaDB.id)
+            .limit(tamanho)
+        )
+        tarefas = (await db.execute(query)).scalars().all()
+        return tarefas_adapter.dump_json(tarefas_adapter.validate_python(tarefas, from_attributes=True))
+
+
+async def pagina_core(inicio: str, tamanho: int) -> bytes:
+    async with main.ReadSessionLocal() as db:
+        query = (
+            select(*main.COLUNAS_LEITURA)
+            .where(tuple_(main.TarefaDB.nome, main.TarefaDB.id) > tuple_(inicio, 0))
+            .order_by(main.TarefaDB.nome, main.TarefaDB.id)
+            .limit(tamanho)
+        )
+        return main.serializar_linhas((await db.execute(query)).all())
+
+
+async def medir(funcao, linhas: int, tamanho: int, paginas: int) -> dict:
+    inicios = [f"tarefa-{(i * 7919) % linhas:07d}" for i in range(paginas)]
+    for inicio in inicios[:10]:  # aquece pool, caches de compilação e páginas do SQLite
+        await funcao(inicio, tamanho)
+
+    picos = []
+    for inicio in inicios:
+        tracemalloc.start()
+        await funcao(inicio, tamanho)
+        picos.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    # Tempos medidos em uma passada separada, sem o tracemalloc (que distorce a CPU)
+    parede, cpu = time.perf_counter(), time.process_time()
+    for inicio in inicios:
+        await funcao(inicio, tamanho)
+    parede, cpu = time.perf_counter() - parede, time.process_time() - cpu
+    return {
+        "parede_por_pagina_us": round(parede / paginas * 1e6, 1),
+        "cpu_por_pagina_us": round(cpu / paginas * 1e6, 1),
+        "pico_memoria_por_pagina_kib": round(statistics.median(picos) / 1024, 1),
+    }
+
+
+async def executar(linhas: int, tamanho: int, paginas: int) -> dict:
+    semear(linhas)
+    inicio = "tarefa-0000000"
+    assert json.loads(await pagina_orm(inicio, tamanho)) == json.loads(await pagina_core(inicio, tamanho))
+    resultados = {
+        "linhas": linhas,
+        "tamanho_pagina": tamanho,
+        "paginas": paginas,
+        "orm": await medir(pagina_orm, linhas, tamanho, paginas),
+        "core": await medir(pagina_core, linhas, tamanho, paginas),
+    }
+    for metrica in ("parede_por_pagina_us", "cpu_por_pagina_us", "pico_memoria_por_pagina_kib"):
+        resultados[f"reducao_{metrica}"] = round(1 - resultados["core"][metrica] / resultados["orm"][metrica], 3)
+    await main.read_engine.dispose()
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--tamanho-pagina", type=int, default=100)
+    parser.add_argument("--paginas", type=int, default=500)
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    resultados = json.dumps(
+        asyncio.run(executar(args.linhas, args.tamanho_pagina, args.paginas)), indent=2, ensure_ascii=False
+    )
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(resultados + "\n")
+    else:
+        print(resultados)
@@ -0,0 +1,79 @@
+"""Orçamento de tempo do ``import main`` (partida a frio de um worker).
+
+Importa o módulo em um subprocesso novo, com as dependências (FastAPI,
+SQLAlchemy, pydantic, passlib) já carregadas, de modo que só o custo do próprio
+``main`` entra na medida. Também confere que o import não tem efeitos colaterais:
+o banco apontado por ``TAREFAS_DB_PATH`` não pode ser criado antes do lifespan.
+
+O bytecode de ``main.py`` é gerado antes, como num deploy; sem ele a compilação
+do fonte entra na conta a cada processo. Sai com código 1 quando a mediana passa do orçamento, para poder rodar em CI.
+
+Uso: python -m benchmarks.inicializacao [--orcamento-ms 100] [--repeticoes N] [--saida arquivo.json]
+"""
+import argparse
+import json
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import tempfile
+
+DEPENDENCIAS = ("fastapi", "fastapi.security", "sqlalchemy", "sqlalchemy.ext.asyncio", "aiosqlite", "pydantic", "passlib.context")
+
+MEDIR_IMPORT = f"""
+import importlib, json, time
+for nome in {DEPENDENCIAS!r}:
+    importlib.import_module(nome)
+inicio = time.perf_counter()
+import main
+print(json.dumps({{"import_ms": (time.perf_counter() - inicio) * 1000}}))
+"""
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_uma_vez(diretorio: str) -> float:
+    banco = os.path.join(diretorio, "app.db")
+    ambiente = {**os.environ, "TAREFAS_DB_PATH": banco}
+    saida = subprocess.run(
+        [sys.executable, "-c", MEDIR_IMPORT], cwd=RAIZ, env=ambiente, capture_output=True, text=True, check=True
+    )
+    if os.path.exists(banco):
+        raise SystemExit(f"import main criou o banco {banco}: a inicialização deve ficar no lifespan")
+    return json.loads(saida.stdout.splitlines()[-1])["import_ms"]
+
+
+def executar(repeticoes: int, orcamento_ms: float) -> dict:
+    py_compile.compile(os.path.join(RAIZ, "main.py"), doraise=True)
+    with tempfile.TemporaryDirectory(prefix="bench-inicializacao-") as diretorio:
+        medidas = [medir_uma_vez(diretorio) for _ in range(repeticoes)]
+    mediana = statistics.median(medidas)
+    return {
+        "repeticoes": repeticoes,
+        "orcamento_ms": orcamento_ms,
+        "import_mediana_ms": round(mediana, 1),
+        "import_max_ms": round(max(medidas), 1),
+        "dentro_do_orcamento": mediana <= orcamento_ms,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--orcamento-ms", type=float, default=float(os.getenv("TAREFAS_IMPORT_BUDGET_MS", "100")),
+        help="Orçamento para a mediana do import (padrão: TAREFAS_IMPORT_BUDGET_MS ou 100)",
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    resultados = executar(args.repeticoes, args.orcamento_ms)
+    saida = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(saida + "\n")
+    else:
+        print(saida)
+    sys.exit(0 if resultados["dentro_do_orcamento"] else 1)
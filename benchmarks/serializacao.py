@@ -0,0 +1,79 @@
+"""Microbenchmark da serialização de uma página de listagem.
+
+Compara, para páginas de 10 e 100 tarefas:
+
+- ``fastapi_padrao``: objetos ORM validados pelo ``response_model`` (from_attributes),
+  convertidos para tipos JSON e codificados com o ``json`` da stdlib, como o FastAPI
+  faz quando o endpoint devolve os objetos;
+- ``pydantic_orm``: objetos ORM validados e codificados pelo pydantic-core
+  (caminho usado pela listagem desde o cache de respostas);
+- ``linhas_diretas``: tuplas do banco codificadas direto (``main.serializar_linhas``,
+  com o ``pydantic_core.to_json``, ou orjson se estiver instalado no ambiente,
+  sem ser dependência do projeto).
+
+Uso: python -m benchmarks.serializacao [--repeticoes N] [--saida arquivo.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import timeit
+from collections import namedtuple
+from typing import List
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="bench-serializacao-")
+os.environ.setdefault("TAREFAS_DB_PATH", os.path.join(_tmpdir.name, "app.db"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+import main  # noqa: E402
+
+tarefas_adapter = TypeAdapter(List[main.Tarefa])
+Linha = namedtuple("Linha", "id nome descricao concluida")
+
+
+def fastapi_padrao(objetos) -> bytes:
+    validados = tarefas_adapter.validate_python(objetos, from_attributes=True)
+    conteudo = tarefas_adapter.dump_python(validados, mode="json")
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def pydantic_orm(objetos) -> bytes:
+    return tarefas_adapter.dump_json(tarefas_adapter.validate_python(objetos, from_attributes=True))
+
+
+def executar(repeticoes: int) -> dict:
+    resultados = {"orjson": main.orjson is not None, "repeticoes": repeticoes, "paginas": {}}
+    for tamanho in (10, 100):
+        dados = [(i, f"tarefa {i}", f"descrição da tarefa número {i}", i % 2 == 0) for i in range(tamanho)]
+        objetos = [main.TarefaDB(id=i, nome=n, descricao=d, concluida=c) for i, n, d, c in dados]
+        linhas = [Linha(*linha) for linha in dados]
+        caminhos = {
+            "fastapi_padrao": lambda: fastapi_padrao(objetos),
+            "pydantic_orm": lambda: pydantic_orm(objetos),
+            "linhas_diretas": lambda: main.serializar_linhas(linhas),
+        }
+        esperado = json.loads(fastapi_padrao(objetos))
+        medidas = {}
+        for nome, funcao in caminhos.items():
+            assert json.loads(funcao()) == esperado, nome
+            melhor = min(timeit.repeat(funcao, number=repeticoes, repeat=5)) / repeticoes
+            medidas[f"{nome}_us"] = round(melhor * 1e6, 2)
+        medidas["ganho_sobre_fastapi_padrao"] = round(medidas["fastapi_padrao_us"] / medidas["linhas_diretas_us"], 1)
+        medidas["ganho_sobre_pydantic_orm"] = round(medidas["pydantic_orm_us"] / medidas["linhas_diretas_us"], 1)
+        resultados["paginas"][str(tamanho)] = medidas
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    parser.add_argument("--saida", help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    resultados = json.dumps(executar(args.repeticoes), indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(resultados + "\n")
+    else:
+        print(resultados)
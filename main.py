@@ -1,42 +1,553 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from pydantic import BaseModel
-from typing import List
+import base64
+import asyncio
+import bisect
+import codecs
+import cProfile
+import csv
+import hashlib
+import hmac
+import json
+import io
+import itertools
+import logging
+import marshal
+import os
+import pstats
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.security import HTTPBasic, HTTPBasicCredentials, HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+from typing import List, Optional
+from passlib import hash as passlib_hash
 from passlib.context import CryptContext
-from sqlalchemy import create_engine, Column, Integer, String, Boolean
+from sqlalchemy import create_engine, event, column, delete, false, func, insert, literal, select, table, text, tuple_, union_all, update, Column, Index, Integer, String, Boolean
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+
+# orjson não é dependência do projeto: o caminho suportado é o pydantic_core.to_json.
+# Se estiver instalado no ambiente, é usado só para codificar as listagens.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuração do banco de dados
-DATABASE_URL = "sqlite:///tarefas.db"
+DATABASE_PATH = os.getenv("TAREFAS_DB_PATH", "tarefas.db")
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+# Engine síncrona só para criar/migrar o esquema (lifespan e CLI)
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-app = FastAPI()
+# Engine assíncrona (aiosqlite) usada pelos endpoints, para não bloquear o event loop
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+logger = logging.getLogger("uvicorn.error")
+
+# Perfis de PRAGMA do SQLite, escolhidos pela variável TAREFAS_SQLITE_PROFILE.
+# "sqlite" mantém os padrões do próprio SQLite (journal de rollback, synchronous=FULL).
+SQLITE_PROFILES = {
+    "padrao": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # valores negativos são em KiB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "seguro": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -16 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "desempenho": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 1024 * 1024 * 1024,
+        "cache_size": -256 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+    "sqlite": {},
+}
+SQLITE_PROFILE = os.getenv("TAREFAS_SQLITE_PROFILE", "padrao")
+if SQLITE_PROFILE not in SQLITE_PROFILES:
+    raise RuntimeError(
+        f"TAREFAS_SQLITE_PROFILE inválido: {SQLITE_PROFILE!r} (opções: {', '.join(SQLITE_PROFILES)})"
+    )
+
+# Aplica o perfil em cada nova conexão, das duas engines
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PROFILES[SQLITE_PROFILE].items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+event.listen(engine, "connect", apply_sqlite_pragmas)
+event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+# Engine somente leitura, com pool próprio, para o tráfego de GET: com WAL os
+# leitores não disputam o pool nem as travas do único escritor
+READ_DATABASE_URL = f"sqlite+aiosqlite:///file:{DATABASE_PATH}?mode=ro&uri=true"
+READ_POOL_SIZE = int(os.getenv("TAREFAS_READ_POOL_SIZE", "10"))
+read_engine = create_async_engine(READ_DATABASE_URL, pool_size=READ_POOL_SIZE, max_overflow=READ_POOL_SIZE)
+ReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+
+def apply_read_only_pragmas(dbapi_connection, connection_record):
+    # journal_mode é persistente no arquivo e definido pelo escritor
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PROFILES[SQLITE_PROFILE].items():
+        if pragma != "journal_mode":
+            cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+event.listen(read_engine.sync_engine, "connect", apply_read_only_pragmas)
+
+# Métricas no formato de exposição do Prometheus. Cada série tem sua própria
+# trava (sem disputa global); o texto é montado só quando /metrics é lido.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape_label(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labelnames: tuple, labelvalues: tuple, extra: tuple = ()) -> str:
+    pares = [f'{nome}="{_escape_label(valor)}"' for nome, valor in zip(labelnames + extra[:1], labelvalues + extra[1:])]
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labelvalues, [threading.Lock(), 0])
+        with series[0]:
+            series[1] += amount
+
+    def collect(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, (_, valor) in list(self._series.items()):
+            linhas.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {valor}")
+        return linhas
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            with self._lock:
+                # [trava, contagem por bucket (+Inf no fim), soma]
+                series = self._series.setdefault(labelvalues, [threading.Lock(), [0] * (len(self.buckets) + 1), 0.0])
+        indice = bisect.bisect_left(self.buckets, value)
+        with series[0]:
+            series[1][indice] += 1
+            series[2] += value
+
+    def collect(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, series in list(self._series.items()):
+            with series[0]:
+                contagens, soma = list(series[1]), series[2]
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (float("inf"),), contagens):
+                acumulado += contagem
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                linhas.append(f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, ('le', le))} {acumulado}")
+            rotulos = _format_labels(self.labelnames, labelvalues)
+            linhas.append(f"{self.name}_sum{rotulos} {soma}")
+            linhas.append(f"{self.name}_count{rotulos} {acumulado}")
+        return linhas
+
+class CallbackMetric:
+    # Valores lidos no momento da coleta, por uma função que devolve {labelvalues: valor}
+    def __init__(self, name: str, documentation: str, labelnames: tuple, callback, metric_type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def collect(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for labelvalues, valor in self.callback().items():
+            linhas.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {valor}")
+        return linhas
+
+def _pool_stats(metodo: str):
+    def coletar() -> dict:
+        pools = {("escrita",): async_engine.pool, ("leitura",): read_engine.pool}
+        return {rotulo: getattr(pool, metodo)() for rotulo, pool in pools.items() if hasattr(pool, metodo)}
+    return coletar
+
+http_requests_total = Counter(
+    "tarefas_http_requests_total", "Requisições HTTP atendidas", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "tarefas_http_request_duration_seconds", "Latência das requisições HTTP", ("method", "route", "status")
+)
+auth_duration = Histogram(
+    "tarefas_auth_duration_seconds", "Tempo gasto autenticando a requisição", ("method",)
+)
+bcrypt_duration = Histogram(
+    "tarefas_bcrypt_verify_duration_seconds", "Tempo de cada verificação de senha com o hash (cache não incluso)"
+)
+password_queue_wait = Histogram(
+    "tarefas_password_queue_wait_seconds", "Espera na fila do executor de senhas até um worker pegar a verificação"
+)
+password_queue_depth = CallbackMetric(
+    "tarefas_password_queue_depth", "Verificações de senha aguardando um worker", (),
+    lambda: {(): password_executor.queue_depth},
+)
+password_rehashes_total = Counter(
+    "tarefas_password_rehashes_total", "Hashes de senha refeitos no login por esquema ou custo desatualizado",
+    ("scheme",),
+)
+db_query_duration = Histogram(
+    "tarefas_db_query_duration_seconds", "Tempo de execução de cada comando SQL", ("engine",)
+)
+serialization_duration = Histogram(
+    "tarefas_serialization_duration_seconds", "Tempo de serialização das respostas de listagem", ("route",)
+)
+auth_cache_lookups = CallbackMetric(
+    "tarefas_auth_cache_lookups_total", "Consultas ao cache de credenciais", ("result",),
+    lambda: {("hit",): credential_cache.hits, ("miss",): credential_cache.misses}, "counter",
+)
+list_cache_lookups = CallbackMetric(
+    "tarefas_list_cache_lookups_total", "Consultas ao cache de respostas da listagem", ("result",),
+    lambda: {("hit",): list_cache.hits, ("miss",): list_cache.misses}, "counter",
+)
+db_pool_checked_out = CallbackMetric(
+    "tarefas_db_pool_checked_out", "Conexões do pool em uso", ("engine",), _pool_stats("checkedout")
+)
+db_pool_checked_in = CallbackMetric(
+    "tarefas_db_pool_checked_in", "Conexões abertas e ociosas no pool", ("engine",), _pool_stats("checkedin")
+)
+db_pool_size = CallbackMetric(
+    "tarefas_db_pool_size", "Tamanho configurado do pool", ("engine",), _pool_stats("size")
+)
+METRICS = [
+    http_requests_total, http_request_duration, auth_duration, bcrypt_duration, password_queue_wait,
+    password_queue_depth, password_rehashes_total, db_query_duration, serialization_duration, auth_cache_lookups,
+    list_cache_lookups, db_pool_checked_out, db_pool_checked_in, db_pool_size,
+]
+
+# Tempo de cada comando SQL, pelos eventos de cursor das duas engines
+def _instrumentar_engine(sync_engine, rotulo: str) -> None:
+    # O início fica no contexto da execução, que morre com ela: um comando que
+    # falha (sem after_cursor_execute) não deixa resto na conexão do pool
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def antes(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.inicio_consulta = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def depois(conn, cursor, statement, parameters, context, executemany):
+        inicio = getattr(context, "inicio_consulta", None)
+        if inicio is not None:
+            db_query_duration.observe(time.perf_counter() - inicio, rotulo)
+
+_instrumentar_engine(async_engine.sync_engine, "escrita")
+_instrumentar_engine(read_engine.sync_engine, "leitura")
+
+# Middleware ASGI puro: mede cada requisição pela rota (modelo do caminho, não a URL)
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        inicio = time.perf_counter()
+        status = 500
+
+        async def send_com_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_com_status)
+        finally:
+            route = scope.get("route")
+            rotulos = (scope["method"], route.path if route is not None else "nao_encontrada", str(status))
+            http_requests_total.inc(*rotulos)
+            http_request_duration.observe(time.perf_counter() - inicio, *rotulos)
+
+# Inicialização fora do import: o esquema é criado/migrado quando o servidor sobe,
+# então importar o módulo (workers, testes, reload) não toca no banco
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    criar_esquema(engine)
+    await reportar_perfil_sqlite()
+    if TOKEN_SECRET_ALEATORIO:
+        logger.warning(
+            "TAREFAS_TOKEN_SECRET não definido: segredo dos tokens gerado para este processo; "
+            "com vários workers ou após reiniciar, os tokens emitidos deixam de valer"
+        )
+    yield
+    await async_engine.dispose()
+    await read_engine.dispose()
+    engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 security = HTTPBasic()
+optional_basic = HTTPBasic(auto_error=False)
+bearer_security = HTTPBearer(auto_error=False)
+
+# Configuração para hash de senhas. O primeiro esquema de TAREFAS_PASSWORD_SCHEMES
+# gera os hashes novos; os demais só são aceitos na verificação. Hashes em um esquema
+# ou custo diferente do configurado são refeitos no próximo login bem-sucedido.
+PASSWORD_SCHEMES = [nome.strip() for nome in os.getenv("TAREFAS_PASSWORD_SCHEMES", "bcrypt").split(",") if nome.strip()]
+BCRYPT_ROUNDS = int(os.getenv("TAREFAS_BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("TAREFAS_ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("TAREFAS_ARGON2_MEMORY_COST", "65536"))  # em KiB
+ARGON2_PARALLELISM = int(os.getenv("TAREFAS_ARGON2_PARALLELISM", "4"))
 
-# Configuração para hash de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def criar_contexto_senhas(
+    schemes: List[str],
+    bcrypt_rounds: int = BCRYPT_ROUNDS,
+    argon2_time_cost: int = ARGON2_TIME_COST,
+    argon2_memory_cost: int = ARGON2_MEMORY_COST,
+    argon2_parallelism: int = ARGON2_PARALLELISM,
+) -> CryptContext:
+    if "argon2" in schemes and not passlib_hash.argon2.has_backend():
+        raise RuntimeError("Esquema argon2 configurado, mas nenhum backend instalado (pip install argon2-cffi)")
+    # min = max = custo configurado: um hash mais barato ou mais caro conta como desatualizado
+    custos = {
+        "bcrypt": {"rounds": bcrypt_rounds, "min_rounds": bcrypt_rounds, "max_rounds": bcrypt_rounds},
+        "argon2": {
+            "rounds": argon2_time_cost,
+            "min_rounds": argon2_time_cost,
+            "max_rounds": argon2_time_cost,
+            "memory_cost": argon2_memory_cost,
+            "parallelism": argon2_parallelism,
+        },
+    }
+    opcoes = {
+        f"{scheme}__{opcao}": valor
+        for scheme in schemes
+        for opcao, valor in custos.get(scheme, {}).items()
+    }
+    return CryptContext(schemes=schemes, deprecated="auto", **opcoes)
+
+pwd_context = criar_contexto_senhas(PASSWORD_SCHEMES)
 
 # Modelo do banco de dados
 class TarefaDB(Base):
     __tablename__ = "tarefas"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     nome = Column(String, index=True, unique=True)
     descricao = Column(String, index=True)
     concluida = Column(Boolean, default=False, index=True)
 
-# Criação das tabelas
-Base.metadata.create_all(bind=engine)
+    # Filtro por estado + ordenação em um único range scan. O SQLite acrescenta o
+    # rowid (id) a todo índice, então estes servem ORDER BY <coluna>, id.
+    __table_args__ = (
+        Index("ix_tarefas_concluida_nome", "concluida", "nome"),
+        Index("ix_tarefas_concluida_descricao", "concluida", "descricao"),
+    )
 
-# Dependência para obter a sessão do banco de dados
-def get_db():
-    db = SessionLocal()
-    try:
+# Índice de busca textual (FTS5) sobre nome/descricao, mantido por triggers
+ESQUEMA_BUSCA = [
+    """CREATE TRIGGER IF NOT EXISTS tarefas_fts_ai AFTER INSERT ON tarefas BEGIN
+        INSERT INTO tarefas_fts(rowid, nome, descricao) VALUES (new.id, new.nome, new.descricao);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tarefas_fts_ad AFTER DELETE ON tarefas BEGIN
+        INSERT INTO tarefas_fts(tarefas_fts, rowid, nome, descricao) VALUES ('delete', old.id, old.nome, old.descricao);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tarefas_fts_au AFTER UPDATE OF nome, descricao ON tarefas BEGIN
+        INSERT INTO tarefas_fts(tarefas_fts, rowid, nome, descricao) VALUES ('delete', old.id, old.nome, old.descricao);
+        INSERT INTO tarefas_fts(rowid, nome, descricao) VALUES (new.id, new.nome, new.descricao);
+    END""",
+]
+tarefas_fts = table("tarefas_fts", column("rowid"), column("rank"), column("tarefas_fts"))
+
+def criar_indice_busca(conn) -> None:
+    existe = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'tarefas_fts'")).first()
+    if not existe:
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE tarefas_fts USING fts5(nome, descricao, content='tarefas', content_rowid='id')"
+        ))
+        # Indexa as tarefas que já existiam antes da tabela de busca
+        conn.execute(text("INSERT INTO tarefas_fts(tarefas_fts) VALUES ('rebuild')"))
+    for ddl in ESQUEMA_BUSCA:
+        conn.execute(text(ddl))
+
+# Contadores mantidos por triggers: total e concluídas em O(1), sem COUNT(*).
+# "versao" muda a cada linha escrita, por qualquer processo: é a versão da tabela
+# usada pelo cache de listagem e pelas ETags, compartilhada entre os workers.
+ESQUEMA_CONTADORES = [
+    """CREATE TRIGGER IF NOT EXISTS tarefas_contadores_ai AFTER INSERT ON tarefas BEGIN
+        UPDATE tarefas_contadores
+        SET total = total + 1, concluidas = concluidas + coalesce(new.concluida, 0), versao = versao + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tarefas_contadores_ad AFTER DELETE ON tarefas BEGIN
+        UPDATE tarefas_contadores
+        SET total = total - 1, concluidas = concluidas - coalesce(old.concluida, 0), versao = versao + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tarefas_contadores_au AFTER UPDATE ON tarefas BEGIN
+        UPDATE tarefas_contadores
+        SET concluidas = concluidas - coalesce(old.concluida, 0) + coalesce(new.concluida, 0), versao = versao + 1;
+    END""",
+]
+tarefas_contadores = table("tarefas_contadores", column("total"), column("concluidas"), column("versao"))
+
+def criar_contadores(conn) -> None:
+    existe = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'tarefas_contadores'")).first()
+    if not existe:
+        conn.execute(text(
+            "CREATE TABLE tarefas_contadores ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL, concluidas INTEGER NOT NULL, "
+            "versao INTEGER NOT NULL DEFAULT 0)"
+        ))
+        # Único COUNT(*): conta as tarefas que já existiam antes dos triggers
+        conn.execute(text(
+            "INSERT INTO tarefas_contadores (id, total, concluidas) "
+            "SELECT 1, count(*), coalesce(sum(concluida), 0) FROM tarefas"
+        ))
+    for ddl in ESQUEMA_CONTADORES:
+        conn.execute(text(ddl))
+
+# Migrações versionadas pelo PRAGMA user_version. Bancos novos já nascem no esquema
+# atual (versão da última migração); bancos existentes passam pelas pendentes antes
+# do create_all, que só cria o que falta. Alterar ou remover índices e colunas de
+# bancos existentes fica a cargo destas. Cada passo é um SQL ou uma função que
+# recebe a conexão.
+def renomear_concluido(conn) -> None:
+    # Bancos da primeira versão do app chamavam a coluna de "concluido"
+    colunas = {linha[1] for linha in conn.exec_driver_sql("PRAGMA table_info(tarefas)")}
+    if "concluido" in colunas:
+        conn.exec_driver_sql("ALTER TABLE tarefas RENAME COLUMN concluido TO concluida")
+
+def versionar_contadores(conn) -> None:
+    colunas = {linha[1] for linha in conn.exec_driver_sql("PRAGMA table_info(tarefas_contadores)")}
+    if colunas and "versao" not in colunas:
+        conn.exec_driver_sql("ALTER TABLE tarefas_contadores ADD COLUMN versao INTEGER NOT NULL DEFAULT 0")
+    # criar_contadores recria os triggers, agora incrementando a versão
+    for gatilho in ("ai", "ad", "au"):
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS tarefas_contadores_{gatilho}")
+
+def nome_unico(conn) -> None:
+    # O esquema original tinha ix_Tarefas_nome sem UNIQUE; como o SQLite compara nomes
+    # de índice sem diferenciar maiúsculas, o CreateIndex do ix_tarefas_nome declarado
+    # era pulado e os INSERT ... ON CONFLICT (nome) falhavam
+    indices = {linha[1].lower(): linha[2] for linha in conn.exec_driver_sql("PRAGMA index_list(tarefas)")}
+    if indices.get("ix_tarefas_nome", 1):
+        return
+    duplicados = conn.exec_driver_sql(
+        "SELECT nome, count(*) FROM tarefas GROUP BY nome HAVING count(*) > 1 ORDER BY nome LIMIT 10"
+    ).all()
+    if duplicados:
+        raise RuntimeError(
+            "Nomes de tarefa duplicados impedem o índice único em tarefas.nome; resolva-os antes de migrar: "
+            + ", ".join(f"{nome!r} ({quantidade}x)" for nome, quantidade in duplicados)
+        )
+    conn.exec_driver_sql("DROP INDEX ix_tarefas_nome")
+    conn.exec_driver_sql("CREATE UNIQUE INDEX ix_tarefas_nome ON tarefas (nome)")
+
+MIGRACOES = [
+    (1, "Remove ix_tarefas_id, redundante com a chave primária (rowid)", [
+        "DROP INDEX IF EXISTS ix_tarefas_id",
+    ]),
+    (2, "Renomeia a coluna concluido (esquema original) para concluida", [
+        renomear_concluido,
+        "DROP INDEX IF EXISTS ix_tarefas_concluido",
+    ]),
+    (3, "Adiciona a versão da tabela aos contadores, incrementada pelos triggers", [
+        versionar_contadores,
+    ]),
+    (4, "Torna único o índice de nome herdado do esquema original", [
+        nome_unico,
+    ]),
+]
+
+def versao_esquema(conn) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+def aplicar_migracoes(conn) -> List[int]:
+    aplicadas = []
+    atual = versao_esquema(conn)
+    for versao, descricao, passos in MIGRACOES:
+        if versao <= atual:
+            continue
+        for passo in passos:
+            if callable(passo):
+                passo(conn)
+            else:
+                conn.exec_driver_sql(passo)
+        conn.exec_driver_sql(f"PRAGMA user_version = {versao}")
+        logger.info("Migração %d aplicada: %s", versao, descricao)
+        aplicadas.append(versao)
+    return aplicadas
+
+# Criação/atualização do esquema; devolve as migrações aplicadas
+def criar_esquema(bind) -> List[int]:
+    with bind.connect() as conn:
+        # BEGIN IMMEDIATE: cada execução é atômica e só um processo migra por vez
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        novo = not conn.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tarefas' COLLATE NOCASE")).first()
+        if novo:
+            aplicadas = []
+            conn.exec_driver_sql(f"PRAGMA user_version = {MIGRACOES[-1][0] if MIGRACOES else 0}")
+        else:
+            aplicadas = aplicar_migracoes(conn)
+        # Tabelas e índices declarados que ainda faltam (inclusive em tabelas já existentes)
+        Base.metadata.create_all(bind=conn)
+        for index in TarefaDB.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        criar_indice_busca(conn)
+        criar_contadores(conn)
+        conn.commit()
+    return aplicadas
+
+async def reportar_perfil_sqlite():
+    # Lê de volta os valores efetivos, para confirmar o que o SQLite aceitou
+    async with async_engine.connect() as conn:
+        efetivos = {}
+        for pragma in SQLITE_PROFILES["padrao"]:
+            efetivos[pragma] = (await conn.exec_driver_sql(f"PRAGMA {pragma}")).scalar()
+    logger.info("Perfil SQLite %r aplicado: %s", SQLITE_PROFILE, efetivos)
+
+# Dependência para obter a sessão assíncrona do banco de dados
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependência para obter uma sessão da engine somente leitura
+async def get_read_db():
+    async with ReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Modelo Pydantic para Tarefa
 class Tarefa(BaseModel):
@@ -47,18 +558,176 @@ class Tarefa(BaseModel):
     class Config:
         from_attributes = True  # Permite mapear objetos do SQLAlchemy para Pydantic
 
-# Banco de dados simulado de usuários (em produção, use um banco de dados real)
+# Banco de dados simulado de usuários (em produção, use um banco de dados real).
+# O hash vem pronto da configuração: calcular um bcrypt no import custaria centenas
+# de ms a cada worker. O padrão corresponde à senha admin123.
+# Para trocar a senha ou adotar a política de hash atual: python main.py hash-senha.
+ADMIN_PASSWORD_HASH = os.getenv(
+    "TAREFAS_ADMIN_PASSWORD_HASH", "$2b$12$CJflSrqtvOEPpd1GV0nb4u1kPJO3zIscjKKRMqPaSlzi8leznYGEq"
+)
+
+# Versão da credencial, usada na assinatura dos tokens. É a mesma em todos os
+# workers e não muda com o rehash no login; por padrão deriva do hash configurado,
+# então trocar a senha na configuração revoga os tokens. Definir a variável
+# explicitamente permite revogá-los sem trocar a senha.
+def versao_credencial(variavel: str, hashed_password: str) -> str:
+    return os.getenv(variavel) or hashlib.sha256(hashed_password.encode()).hexdigest()[:16]
+
 USERS_DB = {
     "admin": {
         "username": "admin",
-        "hashed_password": pwd_context.hash("admin123")  # Senha: admin123
+        "hashed_password": ADMIN_PASSWORD_HASH,
+        "credential_version": versao_credencial("TAREFAS_ADMIN_CREDENTIAL_VERSION", ADMIN_PASSWORD_HASH),
+        "is_admin": True,
     }
 }
 
+# Cache de credenciais já verificadas, para não pagar o bcrypt a cada requisição
+class CredentialCache:
+    """Cache LRU com TTL de pares (usuário, senha) que passaram no bcrypt.
+
+    A senha nunca é guardada: a chave usa um HMAC dela com um segredo do
+    processo. Cada entrada lembra o hash contra o qual foi verificada, então
+    qualquer alteração do usuário em USERS_DB invalida a entrada. Apenas
+    verificações bem-sucedidas são guardadas.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._key = secrets.token_bytes(32)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_key(self, username: str, password: str) -> tuple:
+        digest = hmac.new(self._key, password.encode(), hashlib.sha256).digest()
+        return (username, digest)
+
+    def get(self, username: str, password: str, hashed_password: str) -> bool:
+        key = self._cache_key(username, password)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, cached_hash = entry
+                if expires_at > time.monotonic() and hmac.compare_digest(cached_hash, hashed_password):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True
+                del self._entries[key]
+            self.misses += 1
+            return False
+
+    def set(self, username: str, password: str, hashed_password: str) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._cache_key(username, password)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, hashed_password)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == username]:
+                del self._entries[key]
+
+credential_cache = CredentialCache(
+    ttl=float(os.getenv("TAREFAS_AUTH_CACHE_TTL", "300")),
+    max_size=int(os.getenv("TAREFAS_AUTH_CACHE_SIZE", "1024")),
+)
+
+# Pool exclusivo para as verificações de senha
+class PasswordExecutor:
+    """Pool de threads dedicado ao hash de senhas, com fila limitada.
+
+    O bcrypt libera o GIL, então threads bastam para ocupar vários núcleos. Uma
+    rajada de logins espera neste pool, e não no pool de threads do anyio, que
+    atende as dependências síncronas e o acesso ao banco. Com mais de
+    ``max_queue`` verificações aguardando worker, ``run`` recusa na hora com 503.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.pending = 0  # enviadas e ainda não concluídas (ou canceladas)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tarefas-senhas")
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.pending - self.workers)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.queue_depth >= self.max_queue:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Muitas autenticações em andamento, tente novamente",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+        enviada_em = time.perf_counter()
+
+        def executar():
+            password_queue_wait.observe(time.perf_counter() - enviada_em)
+            return func(*args)
+
+        future = self._executor.submit(executar)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+password_executor = PasswordExecutor(
+    workers=int(os.getenv("TAREFAS_PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.getenv("TAREFAS_PASSWORD_QUEUE_LIMIT", "32")),
+)
+
+def _verificar_hash(password: str, hashed_password: str):
+    inicio = time.perf_counter()
+    resultado = pwd_context.verify_and_update(password, hashed_password)
+    bcrypt_duration.observe(time.perf_counter() - inicio)
+    return resultado
+
+# Verifica a senha, consultando o cache antes de recorrer ao bcrypt
+async def check_password(username: str, password: str) -> bool:
+    user = USERS_DB.get(username)
+    if not user:
+        return False
+    hashed_password = user["hashed_password"]
+    if credential_cache.get(username, password, hashed_password):
+        return True
+    valida, novo_hash = await password_executor.run(_verificar_hash, password, hashed_password)
+    if not valida:
+        return False
+    if novo_hash is not None:
+        # Esquema ou custo desatualizado: aproveita a senha em claro para refazer o hash.
+        # Os usuários vêm da configuração, então o novo hash vale só neste processo
+        # (cada worker refaz o seu, uma vez por boot) até a configuração ser atualizada.
+        user["hashed_password"] = hashed_password = novo_hash
+        password_rehashes_total.inc(pwd_context.identify(novo_hash))
+        logger.warning(
+            "Hash de senha de %r fora da política atual; refeito em memória. "
+            "Gere um novo com 'python main.py hash-senha' e atualize a configuração",
+            username,
+        )
+    credential_cache.set(username, password, hashed_password)
+    return True
+
 # Função para verificar credenciais
-def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
-    user = USERS_DB.get(credentials.username)
-    if not user or not pwd_context.verify(credentials.password, user["hashed_password"]):
+async def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
+    inicio = time.perf_counter()
+    valida = await check_password(credentials.username, credentials.password)
+    auth_duration.observe(time.perf_counter() - inicio, "basic")
+    if not valida:
         raise HTTPException(
             status_code=401,
             detail="Credenciais inválidas",
@@ -66,27 +735,464 @@ def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
         )
     return credentials.username
 
+# Tokens assinados com HMAC: o bcrypt é pago uma vez, no /token
+# Sem TAREFAS_TOKEN_SECRET cada processo sorteia o seu: tokens de um worker não valem
+# nos outros e todo reinício os revoga (o lifespan avisa no log)
+TOKEN_SECRET_ALEATORIO = not os.getenv("TAREFAS_TOKEN_SECRET")
+TOKEN_SECRET = os.getenv("TAREFAS_TOKEN_SECRET", "").encode() or secrets.token_bytes(32)
+TOKEN_TTL = int(os.getenv("TAREFAS_TOKEN_TTL", "3600"))
+TOKEN_MAX_LENGTH = 512  # os tokens emitidos têm ~120 caracteres; o resto nem é decodificado
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def _token_signature(payload: bytes, credential_version: str) -> bytes:
+    # A versão da credencial entra na assinatura: trocá-la revoga os tokens emitidos
+    return hmac.new(TOKEN_SECRET, payload + b"." + credential_version.encode(), hashlib.sha256).digest()
+
+def create_token(username: str) -> str:
+    payload = json.dumps({"sub": username, "exp": int(time.time()) + TOKEN_TTL}, separators=(",", ":")).encode()
+    signature = _token_signature(payload, USERS_DB[username]["credential_version"])
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+def verify_token(token: str) -> Optional[str]:
+    if len(token) > TOKEN_MAX_LENGTH:
+        return None
+    try:
+        payload_b64, signature_b64 = token.split(".")
+        payload = _b64decode(payload_b64)
+        signature = _b64decode(signature_b64)
+        claims = json.loads(payload)
+        # Conteúdo ainda não autenticado: valida os tipos antes de consultar USERS_DB
+        if not isinstance(claims, dict):
+            return None
+        username = claims["sub"]
+        expires_at = claims["exp"]
+    except (ValueError, KeyError, TypeError, OverflowError, RecursionError):
+        return None
+    if not isinstance(username, str) or not isinstance(expires_at, int) or isinstance(expires_at, bool):
+        return None
+    user = USERS_DB.get(username)
+    if not user or expires_at < time.time():
+        return None
+    if not hmac.compare_digest(signature, _token_signature(payload, user["credential_version"])):
+        return None
+    return username
+
+# Aceita um token Bearer emitido pelo /token ou credenciais Basic
+async def verify_token_or_credentials(
+    bearer: Optional[HTTPAuthorizationCredentials] = Depends(bearer_security),
+    basic: Optional[HTTPBasicCredentials] = Depends(optional_basic),
+):
+    if bearer is not None:
+        inicio = time.perf_counter()
+        username = verify_token(bearer.credentials)
+        auth_duration.observe(time.perf_counter() - inicio, "bearer")
+        if username is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Token inválido ou expirado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return username
+    if basic is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Não autenticado",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    return await verify_credentials(basic)
+
+# Exige um usuário administrador (token ou Basic)
+async def verify_admin(username: str = Depends(verify_token_or_credentials)):
+    if not USERS_DB[username].get("is_admin"):
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    return username
+
+# Perfil sob demanda: um administrador envia "X-Profile: 1" e a requisição roda sob
+# o cProfile. Os resultados ficam em um buffer circular lido pelos endpoints /admin.
+# Requisições sem o cabeçalho só pagam a busca pelo cabeçalho. Só tokens Bearer
+# habilitam o perfil: com Basic o middleware verificaria a senha e a rota de novo,
+# dobrando o bcrypt (e a fila do executor de senhas) por requisição.
+PROFILE_HEADER = b"x-profile"
+perfis = deque(maxlen=int(os.getenv("TAREFAS_PROFILE_BUFFER", "20")))
+_perfil_ids = itertools.count(1)
+_perfil_lock = asyncio.Lock()  # o cProfile só admite um perfil ativo por vez
+
+def _usuario_admin(authorization: str) -> bool:
+    scheme, _, valor = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+    username = verify_token(valor.strip())
+    return bool(username and USERS_DB[username].get("is_admin"))
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(nome == PROFILE_HEADER for nome, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        authorization = next((valor.decode("latin-1") for nome, valor in scope["headers"] if nome == b"authorization"), "")
+        if not _usuario_admin(authorization):
+            await self.app(scope, receive, send)
+            return
+
+        perfil_id = next(_perfil_ids)
+        status = 500
+
+        async def send_com_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", str(perfil_id).encode())]}
+            await send(message)
+
+        async with _perfil_lock:
+            profile = cProfile.Profile()
+            inicio = time.perf_counter()
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_com_id)
+            finally:
+                profile.disable()
+                profile.create_stats()
+                perfis.append({
+                    "id": perfil_id,
+                    "metodo": scope["method"],
+                    "caminho": scope["path"],
+                    "query": scope["query_string"].decode("latin-1"),
+                    "status": status,
+                    "duracao_ms": round((time.perf_counter() - inicio) * 1000, 3),
+                    "criado_em": time.time(),
+                    "stats": marshal.dumps(profile.stats),
+                })
+
+app.add_middleware(ProfilingMiddleware)
+
+# Pilhas no formato "colapsado" (flamegraph.pl, speedscope). O cProfile só guarda
+# pares chamador → chamado, então cada pilha é reconstruída subindo pelo chamador
+# de maior tempo acumulado; é uma aproximação das pilhas reais.
+def pilhas_colapsadas(stats: dict) -> str:
+    def nome(func) -> str:
+        arquivo, linha, funcao = func
+        rotulo = funcao if arquivo == "~" else f"{funcao} ({os.path.basename(arquivo)}:{linha})"
+        return rotulo.replace(";", ",")
+
+    def caminho(func) -> List[str]:
+        cadeia, vistos = [], set()
+        while func is not None and func not in vistos:
+            vistos.add(func)
+            cadeia.append(nome(func))
+            chamadores = stats.get(func, (0, 0, 0, 0, {}))[4]
+            func = max(chamadores, key=lambda chamador: chamadores[chamador][3]) if chamadores else None
+        return cadeia[::-1]
+
+    linhas = []
+    for func, (_, _, tempo_proprio, _, chamadores) in stats.items():
+        if not chamadores:
+            if int(tempo_proprio * 1e6):
+                linhas.append(f"{nome(func)} {int(tempo_proprio * 1e6)}")
+            continue
+        for chamador, (_, _, tempo_chamador, _) in chamadores.items():
+            if int(tempo_chamador * 1e6):
+                linhas.append(";".join(caminho(chamador) + [nome(func)]) + f" {int(tempo_chamador * 1e6)}")
+    return "\n".join(linhas) + "\n"
+
+class ResumoPerfil(BaseModel):
+    id: int
+    metodo: str
+    caminho: str
+    query: str
+    status: int
+    duracao_ms: float
+    criado_em: float
+
+@app.get("/admin/perfis", response_model=List[ResumoPerfil])
+async def listar_perfis(username: str = Depends(verify_admin)):
+    return [ResumoPerfil(**{chave: valor for chave, valor in perfil.items() if chave != "stats"}) for perfil in perfis]
+
+@app.get("/admin/perfis/{perfil_id}")
+async def obter_perfil(
+    perfil_id: int,
+    formato: str = Query("texto", regex="^(texto|pstats|collapsed)$", description="texto, pstats (binário) ou collapsed"),
+    username: str = Depends(verify_admin),
+):
+    perfil = next((perfil for perfil in perfis if perfil["id"] == perfil_id), None)
+    if perfil is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    if formato == "pstats":
+        return Response(
+            content=perfil["stats"],
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="perfil-{perfil_id}.pstats"'},
+        )
+    stats = marshal.loads(perfil["stats"])
+    if formato == "collapsed":
+        return PlainTextResponse(pilhas_colapsadas(stats))
+    saida = io.StringIO()
+    relatorio = pstats.Stats(stream=saida)
+    relatorio.stats = stats
+    relatorio.get_top_level_stats()
+    relatorio.sort_stats("cumulative").print_stats(50)
+    return PlainTextResponse(saida.getvalue())
+
+# Exposição das métricas para o Prometheus (sem autenticação, como de costume para scrapers)
+@app.get("/metrics", include_in_schema=False)
+async def metricas():
+    linhas = []
+    for metrica in METRICS:
+        linhas.extend(metrica.collect())
+    return PlainTextResponse("\n".join(linhas) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.post("/token", response_model=Token)
+async def gerar_token(username: str = Depends(verify_credentials)):
+    return Token(access_token=create_token(username), expires_in=TOKEN_TTL)
+
 @app.post("/tarefas/", response_model=Tarefa)
-async def adicionar_tarefa(tarefa: Tarefa, db: Session = Depends(get_db), username: str = Depends(verify_credentials)):
-    # Verifica se já existe uma tarefa com o mesmo nome
-    existing_tarefa = db.query(TarefaDB).filter(TarefaDB.nome == tarefa.nome).first()
-    if existing_tarefa:
+async def adicionar_tarefa(tarefa: Tarefa, db: AsyncSession = Depends(get_db), username: str = Depends(verify_token_or_credentials)):
+    # Inserção atômica: se já existe uma tarefa com o mesmo nome, nenhuma linha volta
+    result = await db.execute(
+        sqlite_insert(TarefaDB)
+        .values(nome=tarefa.nome, descricao=tarefa.descricao, concluida=tarefa.concluida)
+        .on_conflict_do_nothing(index_elements=[TarefaDB.nome])
+        .returning(TarefaDB.nome, TarefaDB.descricao, TarefaDB.concluida)
+    )
+    db_tarefa = result.first()
+    if not db_tarefa:
         raise HTTPException(status_code=400, detail="Tarefa com este nome já existe")
-    
-    # Cria nova tarefa
-    db_tarefa = TarefaDB(nome=tarefa.nome, descricao=tarefa.descricao, concluida=tarefa.concluida)
-    db.add(db_tarefa)
-    db.commit()
-    db.refresh(db_tarefa)
+
+    await db.commit()
     return db_tarefa
 
+# A lista de nomes vai como um único parâmetro JSON (json_each), sem esbarrar
+# no limite de variáveis do SQLite em lotes grandes
+def nomes_json(nomes: List[str]):
+    return select(func.json_each(json.dumps(nomes)).table_valued("value").c.value)
+
+# Modelos de resposta da criação em lote
+class ResultadoItemLote(BaseModel):
+    nome: str
+    status: str  # "criada" ou "conflito"
+
+class ResultadoLote(BaseModel):
+    criadas: int
+    conflitos: int
+    resultados: List[ResultadoItemLote]
+
+@app.post("/tarefas/batch", response_model=ResultadoLote)
+async def adicionar_tarefas_em_lote(tarefas: List[Tarefa], db: AsyncSession = Depends(get_db), username: str = Depends(verify_token_or_credentials)):
+    # Uma única consulta para todos os nomes do lote
+    nomes = [tarefa.nome for tarefa in tarefas]
+    result = await db.execute(select(TarefaDB.nome).where(TarefaDB.nome.in_(nomes_json(nomes))))
+    existentes = set(result.scalars())
+
+    # Nomes repetidos dentro do próprio lote também são conflitos
+    novas = []
+    resultados = []
+    for tarefa in tarefas:
+        if tarefa.nome in existentes:
+            resultados.append(ResultadoItemLote(nome=tarefa.nome, status="conflito"))
+            continue
+        existentes.add(tarefa.nome)
+        novas.append({"nome": tarefa.nome, "descricao": tarefa.descricao, "concluida": tarefa.concluida})
+        resultados.append(ResultadoItemLote(nome=tarefa.nome, status="criada"))
+
+    # executemany em uma única transação (um único commit/fsync)
+    if novas:
+        try:
+            await db.execute(insert(TarefaDB), novas)
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Conflito com uma inserção concorrente; nenhuma tarefa foi criada")
+
+    return ResultadoLote(criadas=len(novas), conflitos=len(tarefas) - len(novas), resultados=resultados)
+
+# Seleção de tarefas para operações em lote: por nomes, por estado, ou ambos
+class FiltroLote(BaseModel):
+    nomes: Optional[List[str]] = None
+    concluida: Optional[bool] = None
+
+class ResultadoOperacaoLote(BaseModel):
+    afetadas: int
+
+def condicoes_lote(filtro: FiltroLote) -> list:
+    if filtro.nomes is None and filtro.concluida is None:
+        raise HTTPException(status_code=400, detail="Informe 'nomes' e/ou 'concluida'")
+    condicoes = []
+    if filtro.nomes is not None:
+        condicoes.append(TarefaDB.nome.in_(nomes_json(filtro.nomes)))
+    if filtro.concluida is not None:
+        condicoes.append(TarefaDB.concluida == filtro.concluida)
+    return condicoes
+
+@app.post("/tarefas/batch/concluir", response_model=ResultadoOperacaoLote)
+async def concluir_tarefas_em_lote(filtro: FiltroLote, db: AsyncSession = Depends(get_db), username: str = Depends(verify_token_or_credentials)):
+    # Um único UPDATE; tarefas já concluídas não contam como afetadas
+    result = await db.execute(
+        update(TarefaDB)
+        .where(*condicoes_lote(filtro), TarefaDB.concluida.is_not(True))
+        .values(concluida=True)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return ResultadoOperacaoLote(afetadas=result.rowcount)
+
+@app.post("/tarefas/batch/remover", response_model=ResultadoOperacaoLote)
+async def remover_tarefas_em_lote(filtro: FiltroLote, db: AsyncSession = Depends(get_db), username: str = Depends(verify_token_or_credentials)):
+    # Um único DELETE
+    result = await db.execute(
+        delete(TarefaDB)
+        .where(*condicoes_lote(filtro))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return ResultadoOperacaoLote(afetadas=result.rowcount)
+
+# Versão da tabela, incrementada pelos triggers de tarefas_contadores: qualquer
+# escrita, em qualquer worker, muda a versão que todos leem (uma linha, O(1))
+async def ler_contadores(db: AsyncSession):
+    result = await db.execute(
+        select(tarefas_contadores.c.versao, tarefas_contadores.c.total, tarefas_contadores.c.concluidas)
+    )
+    return result.one()
+
+# Cache LRU das respostas de listagem, indexado pela versão da tabela; entradas
+# de versões antigas deixam de ser consultadas e saem pelo LRU
+class ResponseCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: tuple, value: tuple) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+list_cache = ResponseCache(max_size=int(os.getenv("TAREFAS_LIST_CACHE_SIZE", "256")))
+
+# Caminho rápido das listagens: as linhas vêm do próprio banco, com os tipos das
+# colunas, então vão direto para JSON no formato de Tarefa, sem validar cada uma
+# de novo pelo Pydantic. O schema do OpenAPI continua vindo do response_model.
+# O to_json do pydantic-core é o codificador padrão; orjson só entra se existir.
+_dumps = orjson.dumps if orjson is not None else to_json
+
+def tarefa_json(linha) -> dict:
+    return {"nome": linha.nome, "descricao": linha.descricao, "concluida": linha.concluida}
+
+def serializar_linhas(linhas) -> bytes:
+    return _dumps([tarefa_json(linha) for linha in linhas])
+
+# Colunas lidas pelos endpoints de leitura: linhas leves do Core, sem instâncias
+# do ORM no identity map da sessão
+COLUNAS_LEITURA = (TarefaDB.id, TarefaDB.nome, TarefaDB.descricao, TarefaDB.concluida)
+
+def make_etag(version: int, key: tuple) -> str:
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+# Estatísticas lidas da tabela de contadores
+class Estatisticas(BaseModel):
+    total: int
+    concluidas: int
+    pendentes: int
+
+async def ler_estatisticas(db: AsyncSession) -> Estatisticas:
+    _, total, concluidas = await ler_contadores(db)
+    return Estatisticas(total=total, concluidas=concluidas, pendentes=total - concluidas)
+
+@app.get("/tarefas/stats", response_model=Estatisticas)
+async def estatisticas_tarefas(username: str = Depends(verify_token_or_credentials), db: AsyncSession = Depends(get_read_db)):
+    return await ler_estatisticas(db)
+
+# Limite superior exclusivo para "começa com": o SQLite compara texto por bytes
+# UTF-8, que seguem a ordem dos code points
+def limite_prefixo(prefixo: str) -> Optional[str]:
+    prefixo = prefixo.rstrip("\U0010ffff")
+    if not prefixo:
+        return None
+    proximo = ord(prefixo[-1]) + 1
+    if 0xD800 <= proximo <= 0xDFFF:
+        proximo = 0xE000
+    return prefixo[:-1] + chr(proximo)
+
+# Cursor opaco da paginação por keyset: codifica (sort_by, valor da chave, id) da última linha
+def encode_cursor(sort_by: str, value, tarefa_id: int) -> str:
+    return _b64encode(json.dumps([sort_by, value, tarefa_id], separators=(",", ":")).encode())
+
+# Tipo do valor da chave em cada ordenação; o valor vai direto para a consulta
+TIPOS_CURSOR = {"nome": (str,), "descricao": (str,), "concluida": (bool,), "rank": (float, int)}
+
+def _inteiro_sqlite(valor) -> bool:
+    # Inteiros fora de 64 bits com sinal estouram no bind do sqlite3
+    return isinstance(valor, int) and not isinstance(valor, bool) and -2**63 <= valor < 2**63
+
+def decode_cursor(cursor: str, sort_by: str) -> tuple:
+    try:
+        cursor_sort_by, value, tarefa_id = json.loads(_b64decode(cursor))
+    except (ValueError, TypeError, RecursionError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if (
+        cursor_sort_by != sort_by
+        or not isinstance(value, TIPOS_CURSOR[sort_by])
+        or (isinstance(value, bool) and sort_by != "concluida")
+        or (sort_by == "rank" and isinstance(value, int) and not _inteiro_sqlite(value))
+        or not _inteiro_sqlite(tarefa_id)
+    ):
+        raise HTTPException(status_code=400, detail="Cursor inválido para esta ordenação")
+    return value, tarefa_id
+
+# Página seguinte a (value, last_id) na ordem (coluna, id). Em vez de um row value,
+# que o SQLite só usa para buscar pela coluna (filtrando o id linha a linha entre as
+# repetições da chave), une duas buscas por faixa no índice (coluna, rowid):
+# o restante da chave atual e as chaves maiores.
+def pagina_keyset(query, sort_column, value, last_id: int, size: int):
+    mesma_chave = query.where(sort_column == value, TarefaDB.id > last_id).limit(size).subquery()
+    chaves_maiores = query.where(sort_column > literal(value, sort_column.type)).limit(size).subquery()
+    pagina = union_all(select(mesma_chave), select(chaves_maiores)).subquery()
+    return select(pagina).order_by(pagina.c[sort_column.key], pagina.c.id).limit(size)
+
 @app.get("/tarefas/", response_model=List[Tarefa])
 async def listar_tarefas(
-    username: str = Depends(verify_credentials),
+    username: str = Depends(verify_token_or_credentials),
     page: int = Query(1, ge=1, description="Número da página"),
     size: int = Query(10, ge=1, le=100, description="Itens por página"),
     sort_by: str = Query("nome", regex="^(nome|descricao|concluida)$", description="Campo para ordenação"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor; substitui page"),
+    concluida: Optional[bool] = Query(None, description="Filtra pelo estado da tarefa"),
+    nome_prefix: Optional[str] = Query(None, min_length=1, description="Filtra por nomes que começam com este texto"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Validação dos parâmetros de paginação
     if page < 1:
@@ -94,38 +1200,316 @@ async def listar_tarefas(
     if size < 1 or size > 100:
         raise HTTPException(status_code=400, detail="O tamanho da página deve estar entre 1 e 100")
 
-    # Consulta com ordenação
-    query = db.query(TarefaDB)
+    # Sem escritas desde a última resposta, o cliente revalida só com a leitura da versão
+    cache_key = (page, size, sort_by, cursor, concluida, nome_prefix)
+    # A mesma leitura traz os contadores usados em X-Total-Count
+    contadores = await ler_contadores(db)
+    version = contadores.versao
+    etag = make_etag(version, cache_key)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    cached = list_cache.get((version, cache_key))
+    if cached is not None:
+        body, headers = cached
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    # Consulta com ordenação; o id desempata e permite a busca por faixa no índice
     if sort_by == "nome":
-        query = query.order_by(TarefaDB.nome)
+        sort_column = TarefaDB.nome
     elif sort_by == "descricao":
-        query = query.order_by(TarefaDB.descricao)
+        sort_column = TarefaDB.descricao
     elif sort_by == "concluida":
-        query = query.order_by(TarefaDB.concluida)
+        sort_column = TarefaDB.concluida
+    # Filtrando por concluida, ordenar por ela é constante: a ordem fica só pelo id,
+    # e o cursor vira uma busca (concluida = ?, id > ?) em ix_tarefas_concluida
+    chave_constante = sort_by == "concluida" and concluida is not None
+    if chave_constante:
+        query = select(*COLUNAS_LEITURA).order_by(TarefaDB.id)
+    else:
+        query = select(*COLUNAS_LEITURA).order_by(sort_column, TarefaDB.id)
 
-    # Paginação
-    start_idx = (page - 1) * size
-    tarefas = query.offset(start_idx).limit(size).all()
-    
-    return tarefas
+    # Filtros por igualdade/faixa, servidos pelos índices compostos (concluida, <coluna>)
+    if concluida is not None:
+        query = query.where(TarefaDB.concluida == concluida)
+    if nome_prefix is not None:
+        query = query.where(TarefaDB.nome >= nome_prefix)
+        limite = limite_prefixo(nome_prefix)
+        if limite is not None:
+            query = query.where(TarefaDB.nome < limite)
+
+    # Paginação: com cursor, busca por faixa a partir da última chave vista
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort_by)
+        if not chave_constante:
+            query = pagina_keyset(query, sort_column, value, last_id, size)
+        elif value == concluida:
+            query = query.where(TarefaDB.id > last_id).limit(size)
+        else:
+            # Cursor vindo de outra listagem: todas as linhas filtradas vêm depois
+            # dele (cursor em False) ou nenhuma (cursor em True)
+            query = (query if value < concluida else query.where(false())).limit(size)
+    else:
+        query = query.offset((page - 1) * size).limit(size)
+    result = await db.execute(query)
+    linhas = result.all()
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    # O total só sai dos contadores quando o filtro é no máximo por estado
+    if nome_prefix is None:
+        if concluida is None:
+            headers["X-Total-Count"] = str(contadores.total)
+        elif concluida:
+            headers["X-Total-Count"] = str(contadores.concluidas)
+        else:
+            headers["X-Total-Count"] = str(contadores.total - contadores.concluidas)
+    if len(linhas) == size:
+        last = linhas[-1]
+        headers["X-Next-Cursor"] = encode_cursor(sort_by, getattr(last, sort_by), last.id)
+    inicio = time.perf_counter()
+    body = serializar_linhas(linhas)
+    serialization_duration.observe(time.perf_counter() - inicio, "/tarefas/")
+    # A versão foi lida antes da página: o conteúdo é no mínimo tão novo quanto ela
+    list_cache.set((version, cache_key), (body, headers))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Converte o texto livre em uma consulta FTS5 segura: cada termo vira uma frase
+# entre aspas (AND implícito); um "*" no fim do termo mantém a busca por prefixo
+def consulta_fts(q: str) -> str:
+    termos = []
+    for termo in q.split():
+        prefixo = termo.endswith("*")
+        termo = termo.rstrip("*")
+        if termo:
+            termos.append('"' + termo.replace('"', '""') + '"' + ("*" if prefixo else ""))
+    if not termos:
+        raise HTTPException(status_code=400, detail="Informe ao menos um termo de busca")
+    return " ".join(termos)
+
+@app.get("/tarefas/search", response_model=List[Tarefa])
+async def buscar_tarefas(
+    q: str = Query(..., min_length=1, description="Termos buscados em nome e descricao"),
+    size: int = Query(10, ge=1, le=100, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em X-Next-Cursor"),
+    username: str = Depends(verify_token_or_credentials),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Resultados ordenados por relevância (bm25) e paginados por (rank, id)
+    query = (
+        select(*COLUNAS_LEITURA, tarefas_fts.c.rank)
+        .join(tarefas_fts, tarefas_fts.c.rowid == TarefaDB.id)
+        .where(tarefas_fts.c.tarefas_fts.op("MATCH")(consulta_fts(q)))
+        .order_by(tarefas_fts.c.rank, TarefaDB.id)
+    )
+    if cursor is not None:
+        last_rank, last_id = decode_cursor(cursor, "rank")
+        query = query.where(tuple_(tarefas_fts.c.rank, TarefaDB.id) > tuple_(last_rank, last_id))
+    result = await db.execute(query.limit(size))
+    linhas = result.all()
+
+    headers = {}
+    if len(linhas) == size:
+        last = linhas[-1]
+        headers["X-Next-Cursor"] = encode_cursor("rank", last.rank, last.id)
+    inicio = time.perf_counter()
+    body = serializar_linhas(linhas)
+    serialization_duration.observe(time.perf_counter() - inicio, "/tarefas/search")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Exportação completa em NDJSON, lida do banco em blocos por um cursor do lado do servidor
+EXPORT_CHUNK_SIZE = int(os.getenv("TAREFAS_EXPORT_CHUNK_SIZE", "1000"))
+
+@app.get("/tarefas/export")
+async def exportar_tarefas(username: str = Depends(verify_token_or_credentials)):
+    # A conexão é aberta dentro do gerador: as dependências terminam antes do streaming
+    async def gerar_linhas():
+        async with read_engine.connect() as conn:
+            result = await conn.stream(
+                select(*COLUNAS_LEITURA).order_by(TarefaDB.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+            )
+            async for linhas in result.partitions():
+                yield b"".join(_dumps(tarefa_json(linha)) + b"\n" for linha in linhas)
+
+    return StreamingResponse(gerar_linhas(), media_type="application/x-ndjson")
+
+# Importação em streaming (NDJSON ou CSV), com commit a cada bloco de linhas
+MAX_IMPORT_LINE = 1024 * 1024
+MAX_IMPORT_ERRORS = 1000
+
+class ErroImportacao(BaseModel):
+    linha: int
+    erro: str
+
+class ResultadoImportacao(BaseModel):
+    linhas: int
+    inseridas: int
+    conflitos: int
+    invalidas: int
+    lotes: int
+    erros: List[ErroImportacao]
+    erros_omitidos: int
+
+def descrever_erro(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(str(campo) for campo in erro['loc']) or 'registro'}: {erro['msg']}" for erro in exc.errors())
+    return f"JSON inválido: {exc}"
+
+async def ler_linhas(request: Request):
+    # Decodifica o corpo aos poucos, sem acumular o upload inteiro em memória
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pendente = ""
+    numero = 0
+    async for chunk in request.stream():
+        pendente += decoder.decode(chunk)
+        *linhas, pendente = pendente.split("\n")
+        for linha in linhas:
+            numero += 1
+            yield numero, linha.rstrip("\r")
+        if len(pendente) > MAX_IMPORT_LINE:
+            raise HTTPException(status_code=413, detail=f"Linha {numero + 1} excede {MAX_IMPORT_LINE} bytes")
+    pendente += decoder.decode(b"", final=True)
+    if pendente:
+        yield numero + 1, pendente.rstrip("\r")
+
+async def ler_registros_csv(linhas):
+    # Campos entre aspas podem conter quebras de linha: junta linhas até as aspas fecharem
+    registro, inicio = None, 0
+    async for numero, linha in linhas:
+        if registro is None:
+            registro, inicio = linha, numero
+        else:
+            registro += "\n" + linha
+        if registro.count('"') % 2 == 0:
+            yield inicio, next(csv.reader([registro]), [])
+            registro = None
+    if registro is not None:
+        yield inicio, next(csv.reader([registro]), [])
+
+CAMPOS_COM_PADRAO = {nome for nome, campo in Tarefa.model_fields.items() if not campo.is_required()}
+
+async def ler_tarefas(request: Request, formato: str):
+    # Produz (linha, dados) para cada registro não vazio do upload
+    if formato == "ndjson":
+        async for numero, linha in ler_linhas(request):
+            if linha.strip():
+                try:
+                    yield numero, json.loads(linha)
+                except ValueError as exc:
+                    yield numero, exc
+                except RecursionError:
+                    yield numero, ValueError("aninhamento excessivo")
+        return
+    cabecalho = None
+    async for numero, campos in ler_registros_csv(ler_linhas(request)):
+        if not any(campos):
+            continue
+        if cabecalho is None:
+            cabecalho = [campo.strip() for campo in campos]
+            continue
+        # Campo vazio só vira "ausente" onde há padrão (concluida); texto vazio é valor
+        dados = {
+            chave: valor for chave, valor in zip(cabecalho, campos) if valor != "" or chave not in CAMPOS_COM_PADRAO
+        }
+        yield numero, dados
+
+@app.post("/tarefas/import", response_model=ResultadoImportacao)
+async def importar_tarefas(
+    request: Request,
+    formato: str = Query("ndjson", regex="^(ndjson|csv)$", description="Formato do corpo: NDJSON ou CSV com cabeçalho"),
+    tamanho_lote: int = Query(5000, ge=1, le=50000, description="Linhas por transação"),
+    db: AsyncSession = Depends(get_db),
+    username: str = Depends(verify_token_or_credentials),
+):
+    resultado = ResultadoImportacao(linhas=0, inseridas=0, conflitos=0, invalidas=0, lotes=0, erros=[], erros_omitidos=0)
+
+    def registrar_erro(numero: int, erro: str):
+        if len(resultado.erros) < MAX_IMPORT_ERRORS:
+            resultado.erros.append(ErroImportacao(linha=numero, erro=erro))
+        else:
+            resultado.erros_omitidos += 1
+
+    async def gravar_lote(lote: dict):
+        # Nomes já existentes (ou repetidos no arquivo) não voltam no RETURNING
+        result = await db.execute(
+            sqlite_insert(TarefaDB).on_conflict_do_nothing(index_elements=[TarefaDB.nome]).returning(TarefaDB.nome),
+            [dados for _, dados in lote.values()],
+        )
+        inseridos = set(result.scalars())
+        await db.commit()
+        resultado.lotes += 1
+        resultado.inseridas += len(inseridos)
+        for nome, (numero, _) in lote.items():
+            if nome not in inseridos:
+                resultado.conflitos += 1
+                registrar_erro(numero, "Tarefa com este nome já existe")
+        logger.info("Importação: lote %d gravado (%d linhas lidas)", resultado.lotes, resultado.linhas)
+
+    lote = {}
+    async for numero, dados in ler_tarefas(request, formato):
+        resultado.linhas += 1
+        try:
+            if isinstance(dados, ValueError):
+                raise dados
+            tarefa = Tarefa.model_validate(dados)
+        except (ValueError, ValidationError) as exc:
+            resultado.invalidas += 1
+            registrar_erro(numero, descrever_erro(exc))
+            continue
+        if tarefa.nome in lote:
+            resultado.conflitos += 1
+            registrar_erro(numero, "Nome repetido no arquivo")
+            continue
+        lote[tarefa.nome] = (numero, tarefa.model_dump())
+        if len(lote) >= tamanho_lote:
+            await gravar_lote(lote)
+            lote = {}
+    if lote:
+        await gravar_lote(lote)
+
+    return resultado
 
 @app.put("/tarefas/{nome_tarefa}", response_model=Tarefa)
-async def marcar_concluida(nome_tarefa: str, db: Session = Depends(get_db), username: str = Depends(verify_credentials)):
-    tarefa = db.query(TarefaDB).filter(TarefaDB.nome == nome_tarefa).first()
+async def marcar_concluida(nome_tarefa: str, db: AsyncSession = Depends(get_db), username: str = Depends(verify_token_or_credentials)):
+    # Busca, atualização e leitura do resultado em um único UPDATE ... RETURNING
+    result = await db.execute(
+        update(TarefaDB)
+        .where(TarefaDB.nome == nome_tarefa)
+        .values(concluida=True)
+        .returning(TarefaDB.nome, TarefaDB.descricao, TarefaDB.concluida)
+        .execution_options(synchronize_session=False)
+    )
+    tarefa = result.first()
     if not tarefa:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
-    
-    tarefa.concluida = True
-    db.commit()
-    db.refresh(tarefa)
+
+    await db.commit()
     return tarefa
 
 @app.delete("/tarefas/{nome_tarefa}")
-async def remover_tarefa(nome_tarefa: str, db: Session = Depends(get_db), username: str = Depends(verify_credentials)):
-    tarefa = db.query(TarefaDB).filter(TarefaDB.nome == nome_tarefa).first()
+async def remover_tarefa(nome_tarefa: str, db: AsyncSession = Depends(get_db), username: str = Depends(verify_token_or_credentials)):
+    result = await db.execute(select(TarefaDB).where(TarefaDB.nome == nome_tarefa))
+    tarefa = result.scalars().first()
     if not tarefa:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     
-    db.delete(tarefa)
-    db.commit()
-    return {"detail": "Tarefa removida com sucesso"}
\ No newline at end of file
+    await db.delete(tarefa)
+    await db.commit()
+    return {"detail": "Tarefa removida com sucesso"}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Utilitários da API de tarefas")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    subparsers.add_parser("migrar", help="Aplica as migrações pendentes do esquema")
+    subparsers.add_parser("hash-senha", help="Gera o hash de uma senha com o esquema e o custo configurados")
+    args = parser.parse_args()
+
+    if args.comando == "migrar":
+        aplicadas = criar_esquema(engine)
+        with engine.connect() as conn:
+            versao = versao_esquema(conn)
+        print(f"Migrações aplicadas: {aplicadas or 'nenhuma'}; versão do esquema: {versao}")
+    elif args.comando == "hash-senha":
+        import getpass
+
+        print(pwd_context.hash(getpass.getpass("Senha: ")))